@@ -6,10 +6,12 @@ import unittest
 
 import six
 from click.testing import CliRunner
+from git import Repo
 from ruamel.yaml.comments import CommentedMap
 
 from unfurl.configurator import Configurator, ConfigurationSpec
 from unfurl.job import JobOptions, Runner
+from unfurl.manifest import SnapShotManifest
 from unfurl.merge import (
     expand_doc,
     restore_includes,
@@ -18,6 +20,7 @@ from unfurl.merge import (
     patch_dict,
     parse_merge_key,
 )
+from unfurl.repo import GitRepo
 from unfurl.runtime import Status, Priority, NodeInstance, OperationalInstance
 from unfurl.util import (
     UnfurlError,
@@ -26,7 +29,7 @@ from unfurl.util import (
     API_VERSION,
     sensitive_str,
 )
-from unfurl.yamlloader import YamlConfig
+from unfurl.yamlloader import YamlConfig, make_vault_lib
 from unfurl.yamlmanifest import YamlManifest
 
 
@@ -146,6 +149,19 @@ class ExpandDocTest(unittest.TestCase):
             """recursive include "['test4']" in "('test4',)" when including +../test4""",
         )
 
+    def test_readonly_vault(self):
+        vault = make_vault_lib("a_password")
+        ciphertext = vault.encrypt("a secret").decode()
+        doc = "secret: !vault |\n" + "".join(
+            "  " + line + "\n" for line in ciphertext.splitlines()
+        )
+        # load twice because the read-only loader is cached per vault
+        for i in range(2):
+            config = YamlConfig(doc, vault=vault, readonly=True)
+            secret = config.config["secret"]
+            assert isinstance(secret, sensitive_str), type(secret)
+            self.assertEqual(secret, "a secret")
+
 
 class JobTest(unittest.TestCase):
     def test_lookupClass(self):
@@ -456,6 +472,34 @@ spec:
             assert config.config["+?include2"] == "missing.yaml"
             assert "a" not in config.config["spec"]
 
+    def test_snapshot_anchors(self):
+        instanceYaml = """
+apiVersion: unfurl/v1alpha1
+kind: Manifest
+dsl:
+  foo: &foo
+    d: 5
+spec:
+  +*foo:
+  b: 3
+status: {}
+"""
+        cliRunner = CliRunner()
+        with cliRunner.isolated_filesystem():
+            repo = Repo.init(".")
+            with open("ensemble.yaml", "w") as f:
+                f.write(instanceYaml)
+            repo.index.add(["ensemble.yaml"])
+            commit = repo.index.commit("Initial Commit")
+
+            manifest = YamlManifest(path="ensemble.yaml")
+            manifest.repo = GitRepo(repo)
+            change = dict(specDigest="previous", startCommit=commit.hexsha)
+            snapshot = manifest.revisions.get_revision(change)
+            assert isinstance(snapshot, SnapShotManifest)
+            assert snapshot.manifest.expanded["spec"]["b"] == 3
+            assert snapshot.manifest.expanded["spec"]["d"] == 5
+
             configYaml = """
 kind: Project
 +?include: local/unfurl.yaml
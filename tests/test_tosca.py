@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 import os
 import unfurl.manifest
 from unfurl.yamlmanifest import YamlManifest
@@ -9,9 +10,12 @@ from unfurl.projectpaths import _get_base_dir
 from unfurl.configurator import Configurator
 from unfurl.util import sensitive_str, API_VERSION, UnfurlValidationError
 from unfurl.yamlloader import make_vault_lib
-import six
+from toscaparser.elements.portspectype import PortSpec
+import io
 from click.testing import CliRunner
 import json
+import copy
+from unfurl.yamlloader import yaml
 
 # python 2.7 needs these:
 from unfurl.configurators.shell import ShellConfigurator
@@ -19,16 +23,13 @@ from unfurl.configurators.shell import ShellConfigurator
 
 class SetAttributeConfigurator(Configurator):
     def run(self, task):
-        from toscaparser.elements.portspectype import PortSpec
-
         if "ports" in task.inputs:
             ports = task.inputs["ports"]
             # target:source
-            assert PortSpec(ports[0]).spec == "50000:9000", PortSpec(ports[0]).spec
-            assert PortSpec(ports[1]).spec == "20000-60000:1000-10000/udp", PortSpec(
-                ports[1]
-            ).spec
-            assert PortSpec(ports[2]).spec == "8000", PortSpec(ports[2]).spec
+            specs = [PortSpec(port).spec for port in ports[:3]]
+            assert specs[0] == "50000:9000", specs[0]
+            assert specs[1] == "20000-60000:1000-10000/udp", specs[1]
+            assert specs[2] == "8000", specs[2]
 
         task.target.attributes["private_address"] = "10.0.0.1"
         yield task.done(True, Status.ok)
@@ -163,8 +164,15 @@ spec:
                 timeout: 120
 """
 
-manifestDoc = _manifestDoc % "{cpus: 2}"
-missingInputsDoc = _manifestDoc % "{}"
+# parse these once, tests get a copy since loading a manifest modifies it
+_parsedManifestDoc = yaml.load(_manifestDoc % "{cpus: 2}")
+_parsedMissingInputsDoc = yaml.load(_manifestDoc % "{}")
+
+
+def manifest_doc(missingInputs=False):
+    return copy.deepcopy(
+        _parsedMissingInputsDoc if missingInputs else _parsedManifestDoc
+    )
 
 
 class ToscaSyntaxTest(unittest.TestCase):
@@ -174,7 +182,8 @@ class ToscaSyntaxTest(unittest.TestCase):
     def _runInputAndOutputs(self, manifest):
         job = Runner(manifest).run(JobOptions(add=True, startTime="time-to-test"))
         assert not job.unexpectedAbort, job.unexpectedAbort.get_stack_trace()
-        my_server = manifest.get_root_resource().find_resource("my_server")
+        root = manifest.get_root_resource()
+        my_server = root.find_resource("my_server")
         assert my_server
         self.assertEqual(
             "10 GB", my_server.query({"get_property": ["SELF", "host", "disk_size"]})
@@ -182,18 +191,19 @@ class ToscaSyntaxTest(unittest.TestCase):
         assert my_server.attributes["test"] == "cpus: 2"
         assert my_server.attributes["concat2"] is None
         # print(job.out.getvalue())
-        testSensitive = manifest.get_root_resource().find_resource("testSensitive")
+        testSensitive = root.find_resource("testSensitive")
+        propertyDefs = testSensitive.template.propertyDefs
         for name, toscaType in (
             ("access_token", "tosca.datatypes.Credential"),
             ("TEST_VAR", "unfurl.datatypes.EnvVar"),
         ):
-            assert testSensitive.template.propertyDefs[name].schema["type"] == toscaType
+            assert propertyDefs[name].schema["type"] == toscaType
 
         def t(datatype):
             return datatype.type == "unfurl.datatypes.EnvVar"
 
         envvars = set(testSensitive.template.find_props(testSensitive.attributes, t))
-        self.assertEqual(envvars, set([("TEST_VAR", "foo"), ("VAR1", "more")]))
+        self.assertEqual(envvars, {("TEST_VAR", "foo"), ("VAR1", "more")})
         outputIp = job.get_outputs()["server_ip"]
         self.assertEqual(outputIp, "10.0.0.1")
         assert isinstance(outputIp, sensitive_str), type(outputIp)
@@ -203,9 +213,9 @@ class ToscaSyntaxTest(unittest.TestCase):
 
     def test_inputAndOutputs(self):
         with self.assertRaises(UnfurlValidationError) as err:
-            manifest = YamlManifest(missingInputsDoc)
+            manifest = YamlManifest(manifest_doc(missingInputs=True))
 
-        manifest = YamlManifest(manifestDoc)
+        manifest = YamlManifest(manifest_doc())
         outputIp, job = self._runInputAndOutputs(manifest)
         self.assertEqual(
             ["my_server", "testSensitive"],
@@ -226,14 +236,14 @@ class ToscaSyntaxTest(unittest.TestCase):
         assert "server_ip: <<REDACTED>>" in job.out.getvalue(), job.out.getvalue()
 
     def test_ansibleVault(self):
-        manifest = YamlManifest(manifestDoc, vault=make_vault_lib("a_password"))
+        manifest = YamlManifest(manifest_doc(), vault=make_vault_lib("a_password"))
         outputIp, job = self._runInputAndOutputs(manifest)
         vaultString = "server_ip: !vault |\n      $ANSIBLE_VAULT;1.1;AES256"
         assert vaultString in job.out.getvalue(), job.out.getvalue()
 
         from unfurl.yamlloader import cleartext_yaml
 
-        manifest = YamlManifest(manifestDoc, vault=cleartext_yaml.representer.vault)
+        manifest = YamlManifest(manifest_doc(), vault=cleartext_yaml.representer.vault)
         outputIp, job = self._runInputAndOutputs(manifest)
         assert "!vault" not in job.out.getvalue(), job.out.getvalue()
 
@@ -251,7 +261,7 @@ class ToscaSyntaxTest(unittest.TestCase):
         ]
 
         runner = Runner(manifest)
-        output = six.StringIO()
+        output = io.StringIO()
         job = runner.run(JobOptions(add=True, out=output, startTime="test"))
         self.assertEqual(job.status.name, "ok")
         self.assertEqual(job.stats()["ok"], 1)
@@ -310,21 +320,20 @@ class ToscaSyntaxTest(unittest.TestCase):
 
     @unittest.skipIf("k8s" in os.getenv("UNFURL_TEST_SKIP", ""), "UNFURL_TEST_SKIP set")
     def test_workflows(self):
-        os.environ["UNFURL_WORKDIR"] = os.environ["UNFURL_TMPDIR"]
-        manifest = YamlManifest(
-            path=__file__ + "/../examples/test-workflow-ensemble.yaml"
-        )
-        # print(manifest.tosca.template.nested_tosca_tpls)
-        self.assertEqual(len(manifest.tosca._workflows), 3)
-
-        runner = Runner(manifest)
-        output = six.StringIO()
-        job = runner.run(
-            JobOptions(
-                add=True, check=True, planOnly=False, out=output, startTime="test"
+        with mock.patch.dict(os.environ, UNFURL_WORKDIR=os.environ["UNFURL_TMPDIR"]):
+            manifest = YamlManifest(
+                path=__file__ + "/../examples/test-workflow-ensemble.yaml"
+            )
+            # print(manifest.tosca.template.nested_tosca_tpls)
+            self.assertEqual(len(manifest.tosca._workflows), 3)
+
+            runner = Runner(manifest)
+            output = io.StringIO()
+            job = runner.run(
+                JobOptions(
+                    add=True, check=True, planOnly=False, out=output, startTime="test"
+                )
             )
-        )
-        del os.environ["UNFURL_WORKDIR"]
         # print(json.dumps(job.json_summary(), indent=2))
         assert not job.unexpectedAbort, job.unexpectedAbort.get_stack_trace()
         self.assertEqual(job.status.name, "ok")
@@ -506,11 +515,10 @@ spec:
             % API_VERSION
         )
 
-        runner = CliRunner()  # delete UNFURL_HOME
-        try:
-            UNFURL_HOME = os.environ.get("UNFURL_HOME")
+        runner = CliRunner()
+        # clear UNFURL_HOME so the home project isn't used
+        with mock.patch.dict(os.environ, UNFURL_HOME=""):
             with runner.isolated_filesystem():
-                os.environ["UNFURL_HOME"] = ""
 
                 with open("foreignmanifest.yaml", "w") as f:
                     f.write(foreign)
@@ -552,14 +560,15 @@ spec:
                 self.assertEqual(
                     len(manifest.localEnv._manifests), 2, manifest.localEnv._manifests
                 )
-                # print("output", job.out.getvalue())
-                assert "10.0.0.1" not in job.out.getvalue(), job.out.getvalue()
+                out = job.out.getvalue()
+                # print("output", out)
+                assert "10.0.0.1" not in out, out
                 vaultString1 = "server_ip: !vault |\n      $ANSIBLE_VAULT;1.1;AES256"
-                assert vaultString1 in job.out.getvalue()
+                assert vaultString1 in out
                 vaultString2 = (
                     "private_address: !vault |\n          $ANSIBLE_VAULT;1.1;AES256"
                 )
-                assert vaultString2 in job.out.getvalue()
+                assert vaultString2 in out
 
                 # reload:
                 manifest2 = LocalEnv("manifest.yaml").get_manifest()
@@ -573,9 +582,6 @@ spec:
                 self.assertIs(imported2.root, manifest2.get_root_resource())
                 self.assertEqual(imported2.attributes["private_address"], "10.0.0.1")
                 self.assertIsNot(imported2.shadow.root, manifest2.get_root_resource())
-        finally:
-            if UNFURL_HOME is not None:
-                os.environ["UNFURL_HOME"] = UNFURL_HOME
 
     def test_connections(self):
         mainManifest = (
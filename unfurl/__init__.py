@@ -1,5 +1,6 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2020 Adam Souzis
+import functools
 import logging
 import os
 import sys
@@ -13,8 +14,9 @@ from unfurl import logs
 logs.initialize_logging()
 
 
+@functools.lru_cache(maxsize=None)
 def __version__(release=False):
-    # a function because this is expensive
+    # a function because this is expensive (so cache the result)
     if release:  # appends .devNNN
         return pbr.version.VersionInfo(__name__).release_string()
     else:  # semver only
@@ -31,7 +33,8 @@ def is_version_unreleased():
     return len(version_tuple()) > 3
 
 
-vendor_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "vendor")
+_basepath = os.path.abspath(os.path.dirname(__file__))
+vendor_dir = os.path.join(_basepath, "vendor")
 sys.path.insert(0, vendor_dir)
 
 
@@ -76,8 +79,8 @@ def get_home_config_path(homepath):
 
 ### Ansible initialization
 if "ANSIBLE_CONFIG" not in os.environ:
-    os.environ["ANSIBLE_CONFIG"] = os.path.abspath(
-        os.path.join(os.path.dirname(__file__), "configurators", "ansible.cfg")
+    os.environ["ANSIBLE_CONFIG"] = os.path.join(
+        _basepath, "configurators", "ansible.cfg"
     )
 try:
     import ansible
@@ -108,5 +111,5 @@ else:
 
     from ansible.plugins.loader import filter_loader, lookup_loader
 
-    lookup_loader.add_directory(os.path.abspath(os.path.dirname(__file__)), True)
-    filter_loader.add_directory(os.path.abspath(os.path.dirname(__file__)), True)
+    lookup_loader.add_directory(_basepath, True)
+    filter_loader.add_directory(_basepath, True)
@@ -24,13 +24,11 @@ from typing import Optional
 import click
 
 from . import DefaultNames, __version__, get_home_config_path
-from . import init as initmod
 from . import logs, version_tuple
-from .job import start_job
-from .localenv import LocalEnv, Project
 from .logs import Levels
-from .support import Status
-from .util import filter_env, get_package_digest
+
+# note: the modules that load ensembles (e.g. .job, .localenv, .init) are imported
+# inside the commands that need them to speed up commands that don't
 
 _latestJobs = []  # for testing
 _args = []  # for testing
@@ -157,7 +155,7 @@ readonlyJobControlOptions = option_group(
     click.option("-m", "--message", help="commit message to use"),
     click.option(
         "--jobexitcode",
-        type=click.Choice(["error", "degraded", "never"]),
+        type=click.Choice(["error", "degraded", "never"], case_sensitive=False),
         default="never",
         help="Set exit code to 1 if job status is not ok.",
     ),
@@ -234,6 +232,8 @@ def run(ctx, instance="root", cmdline=None, **options):
 
 
 def _get_runtime(options, ensemblePath):
+    from .localenv import LocalEnv
+
     runtime = options.get("runtime")
     localEnv = None
     if not runtime:
@@ -250,6 +250,8 @@ def _run(ensemble, options, workflow=None):
         runtime, localEnv = _get_runtime(options, ensemble)
         if runtime and runtime != ".":
             if not localEnv:
+                from .localenv import LocalEnv
+
                 localEnv = LocalEnv(ensemble, options.get("home"))
             return _run_remote(runtime, options, localEnv)
     return _run_local(ensemble, options)
@@ -274,6 +276,8 @@ def _remote_cmd(runtime_, cmd_line, local_env):
             envvar_filter[name] = os.environ[name]
 
     if envvar_filter:
+        from .util import filter_env
+
         addOnly = kind == "docker"
         env = filter_env(local_env.map_value(envvar_filter), addOnly=addOnly)
     else:
@@ -455,6 +459,8 @@ def _stop_logging(job, options, verbose, tmplogfile):
 
 
 def _run_local(ensemble, options):
+    from .job import start_job
+
     verbose = options.get("verbose", 0)
     tmplogfile = None
     if not options["logfile"]:
@@ -484,11 +490,13 @@ def _run_local(ensemble, options):
 
 
 def _exit(job, options):
-    if not job or (
-        "jobexitcode" in options
-        and options["jobexitcode"] != "never"
-        and Status[options["jobexitcode"]] <= job.status
-    ):
+    from .support import Status
+
+    # "never" (or no option) maps to None
+    exitStatus = dict(error=Status.error, degraded=Status.degraded).get(
+        options.get("jobexitcode")
+    )
+    if not job or (exitStatus is not None and exitStatus <= job.status):
         if options.get("standalone_mode") is False:
             return 1
         else:
@@ -685,6 +693,9 @@ def init(ctx, projectdir, ensemble_name=None, **options):
         else:  # otherwise use the current directory
             projectdir = "."
 
+    from . import init as initmod
+    from .localenv import Project
+
     projectPath = Project.find_path(projectdir)
     if projectPath:
         # dest is already in a project, so create a new ensemble in it instead of a new project
@@ -742,6 +753,8 @@ def home(ctx, init=False, render=False, replace=False, **options):
         click.echo(get_home_config_path(options.get("home")))
         return
 
+    from . import init as initmod
+
     homePath = initmod.create_home(render=render, replace=replace, **options)
     action = "rendered" if render else "created"
     if homePath:
@@ -783,6 +796,8 @@ def runtime(ctx, project_folder, init=False, **options):
         click.echo(f"\nCurrent runtime: {runtime_}")
         return
 
+    from . import init as initmod
+
     runtime_ = options.get("runtime") or "venv:"
     error = initmod.init_engine(project_path, runtime_)
     if not error:
@@ -827,8 +842,9 @@ def clone(ctx, source, dest, **options):
     DEST   Path to the new project or ensemble
     """
 
-    options.update(ctx.obj)
+    from . import init as initmod
 
+    options.update(ctx.obj)
     message = initmod.clone(source, dest, **options)
     click.echo(message)
 
@@ -848,6 +864,8 @@ def clone(ctx, source, dest, **options):
 def git(ctx, gitargs, dir="."):
     """
     unfurl git [git command] [git command arguments]: Run the given git command on each project repository."""
+    from .localenv import LocalEnv
+
     localEnv = LocalEnv(dir, ctx.obj.get("home"), can_be_empty=True)
     if localEnv.manifestPath:
         repos = {
@@ -914,6 +932,8 @@ def get_commit_message(committer):
 )
 def commit(ctx, project_or_ensemble_path, message, skip_add, no_edit, **options):
     """Commit any outstanding changes to the given project or ensemble."""
+    from .localenv import LocalEnv
+
     options.update(ctx.obj)
     localEnv = LocalEnv(
         project_or_ensemble_path, options.get("home"), can_be_empty=True
@@ -947,6 +967,8 @@ def commit(ctx, project_or_ensemble_path, message, skip_add, no_edit, **options)
 )
 def git_status(ctx, project_or_ensemble_path, dirty, **options):
     "Show the git status for paths relevant to the given project or ensemble."
+    from .localenv import LocalEnv
+
     options.update(ctx.obj)
     localEnv = LocalEnv(
         project_or_ensemble_path, options.get("home"), can_be_empty=True
@@ -967,6 +989,8 @@ def git_status(ctx, project_or_ensemble_path, dirty, **options):
 @click.argument("ensemble", default=".", type=click.Path(exists=True))
 def status(ctx, ensemble, **options):
     """Show the status of deployed resources in the given ensemble."""
+    from .localenv import LocalEnv
+
     options.update(ctx.obj)
     localEnv = LocalEnv(ensemble, options.get("home"))
     click.echo(localEnv.get_manifest().status_summary())
@@ -992,6 +1016,8 @@ def version(ctx, semver=False, remote=False, **options):
     if semver:
         click.echo(__version__())
     else:
+        from .util import get_package_digest
+
         click.echo(f"unfurl version {__version__(True)} ({get_package_digest()})")
 
     if remote and not options.get("no_runtime"):
@@ -1038,6 +1064,8 @@ def main():
 
 
 def vaultclient():
+    from .localenv import LocalEnv
+
     try:
         localEnv = LocalEnv(".", can_be_empty=True)
     except Exception as err:
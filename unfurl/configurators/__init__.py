@@ -10,8 +10,11 @@ import importlib
 # and so won't register themselves through AutoRegisterClass
 register_short_names(
     {
-        name: f"unfurl.configurators.{name.lower()}.{name}Configurator"
-        for name in "Ansible Shell Supervisor Terraform DNS".split()
+        "Ansible": "unfurl.configurators.ansible.AnsibleConfigurator",
+        "Shell": "unfurl.configurators.shell.ShellConfigurator",
+        "Supervisor": "unfurl.configurators.supervisor.SupervisorConfigurator",
+        "Terraform": "unfurl.configurators.terraform.TerraformConfigurator",
+        "DNS": "unfurl.configurators.dns.DNSConfigurator",
     }
 )
 
@@ -183,24 +183,21 @@ class ConfigTask(ConfigChange, TaskView):
     def status(self):
         return self.local_status
 
-    def priority():
-        doc = "The priority property."
-
-        def fget(self):
-            if self._priority is None:
-                return self.configSpec.should_run()
-            else:
-                return self._priority
-
-        def fset(self, value):
-            self._priority = value
-
-        def fdel(self):
-            del self._priority
+    @property
+    def priority(self):
+        "The priority property."
+        if self._priority is None:
+            return self.configSpec.should_run()
+        else:
+            return self._priority
 
-        return locals()
+    @priority.setter
+    def priority(self, value):
+        self._priority = value
 
-    priority = property(**priority())
+    @priority.deleter
+    def priority(self):
+        del self._priority
 
     @property
     def configurator(self):
@@ -480,9 +477,9 @@ class Job(ConfigChange):
         self.jobOptions = jobOptions
         self.manifest = manifest
         self.rootResource = rootResource
-        self.jobRequestQueue = []
+        self.jobRequestQueue = collections.deque()
         self.unexpectedAbort = None
-        self.workDone = collections.OrderedDict()
+        self.workDone = {}
         self.timeElapsed = 0
         self.plan_requests = None
         self.task_count = 0
@@ -547,7 +544,7 @@ class Job(ConfigChange):
         else:
             ready, notReady, errors = self.render()
 
-        self.workDone = collections.OrderedDict()
+        self.workDone = {}
 
         if errors:
             logger.error("Aborting job: there were errors during rendering: %s", errors)
@@ -557,6 +554,8 @@ class Job(ConfigChange):
         while ready:
             # XXX need to call self.run_external() here if update_plan() adds external job
             # create and run tasks for requests that have their dependencies fulfilled
+            # note: tasks are run one at a time, each task installs its own AttributeManager
+            # on the shared root instance and changes are committed in the order tasks finish
             self.apply(ready)
             # remove requests from notReady if they've had all their dependencies fulfilled
             ready, notReady = set_fulfilled(notReady, ready)
@@ -576,7 +575,7 @@ class Job(ConfigChange):
         # the jobRequestQueue will have jobs that were added dynamically by a configurator
         # but were not yielding inside runTask
         while self.jobRequestQueue:
-            jobRequest = self.jobRequestQueue[0]
+            jobRequest = self.jobRequestQueue.popleft()
             self.run_job_request(jobRequest)
 
         return self.rootResource
@@ -722,7 +721,6 @@ class Job(ConfigChange):
                 )
                 continue
             if isinstance(taskRequest, JobRequest):
-                self.jobRequestQueue.append(taskRequest)
                 self.run_job_request(taskRequest)
                 continue
             elif isinstance(taskRequest, TaskRequestGroup):
@@ -746,7 +744,8 @@ class Job(ConfigChange):
 
     def run_job_request(self, jobRequest):
         logger.debug("running jobrequest: %s", jobRequest)
-        if self.jobRequestQueue:
+        if jobRequest in self.jobRequestQueue:
+            # it was queued (by TaskView.update_instances) and then yielded
             self.jobRequestQueue.remove(jobRequest)
         instance_specs = jobRequest.get_instance_specs()
         jobOptions = self.jobOptions.copy(parentJob=self, instances=instance_specs)
@@ -1051,7 +1050,14 @@ class Job(ConfigChange):
             except Exception:
                 UnfurlTaskError(task, "configurator.run failed")
                 return task.finished(ConfiguratorResult(False, None, Status.error))
-            if isinstance(result, PlanRequest):
+            # every configurator ends by yielding its result so check for that first
+            if isinstance(result, ConfiguratorResult):
+                retVal = task.finished(result)
+                logger.debug(
+                    "completed task %s: %s; %s", task, task.target.status, result
+                )
+                return retVal
+            elif isinstance(result, PlanRequest):
                 if depth >= self.MAX_NESTED_SUBTASKS:
                     UnfurlTaskError(task, "too many subtasks spawned")
                     change = task.finished(ConfiguratorResult(False, None))
@@ -1065,21 +1071,16 @@ class Job(ConfigChange):
             elif isinstance(result, JobRequest):
                 job = self.run_job_request(result)
                 change = job
-            elif isinstance(result, ConfiguratorResult):
-                retVal = task.finished(result)
-                logger.debug(
-                    "completed task %s: %s; %s", task, task.target.status, result
-                )
-                return retVal
             else:
                 UnfurlTaskError(task, "unexpected result from configurator")
                 return task.finished(ConfiguratorResult(False, None, Status.error))
 
     def add_work(self, task):
         key = id(task)
-        self.workDone[key] = task
-        if self.parentJob:
-            self.parentJob.add_work(task)
+        job = self
+        while job:
+            job.workDone[key] = task
+            job = job.parentJob
 
     def increment_task_count(self):
         if self.parentJob:
@@ -30,6 +30,61 @@ logger = logging.getLogger("unfurl")
 
 _basepath = os.path.abspath(os.path.dirname(__file__))
 
+# (name, default) of the attributes copied as-is from a change record
+_ChangeRecordAttributes = (
+    ("changeId", 0),
+    ("previousId", None),
+    ("target", None),
+    ("inputs", None),
+    ("result", None),
+)
+
+# optional positional arguments to Dependency() after "ref"
+_DependencyFields = ("expected", "schema", "name", "required")
+
+
+def _load_status(status, instance=None):
+    if not instance:
+        instance = OperationalInstance()
+    if not status:
+        return instance
+
+    instance._priority = to_enum(Priority, status.get("priority"))
+    instance._lastStateChange = status.get("lastStateChange")
+    instance._lastConfigChange = status.get("lastConfigChange")
+
+    readyState = status.get("readyState")
+    # usually a string so test for that before the (slower) Mapping ABC check
+    if isinstance(readyState, str) or not isinstance(readyState, Mapping):
+        instance._localStatus = to_enum(Status, readyState)
+    else:
+        instance._localStatus = to_enum(Status, readyState.get("local"))
+        instance._state = to_enum(NodeState, readyState.get("state"))
+
+    return instance
+
+
+def _load_resource_changes(changes):
+    resourceChanges = ResourceChanges()
+    if changes:
+        for k, change in changes.items():
+            # don't modify change, it might be part of the original document
+            status = change.get(".status")
+            if isinstance(status, dict):
+                status = _load_status(status).local_status
+            else:
+                status = to_enum(Status, status)
+            resourceChanges[k] = [
+                status,
+                change.get(".added"),
+                {
+                    key: value
+                    for key, value in change.items()
+                    if key != ".status" and key != ".added"
+                },
+            ]
+    return resourceChanges
+
 
 class Manifest(AttributeManager):
     """
@@ -46,21 +101,23 @@ class Manifest(AttributeManager):
         self.repo = self._find_repo()
         self.currentCommitId = self.repo and self.repo.revision
         self.revisions = RevisionManager(self)
+        self._templateCache = {}
         self.changeSets = None
         self.tosca = None
         self.specDigest = None
         self.repositories = {}
 
-    def _set_spec(self, config, more_spec=None):
+    def _set_spec(self, config, more_spec=None, specDigest=None):
         """
         Set the TOSCA service template.
+        If ``specDigest`` is given it is assumed to be the digest of this spec.
         """
         repositories = {
             name: repo.repository.tpl for name, repo in self.repositories.items()
         }
         spec = config.get("spec", {})
         self.tosca = self._load_spec(spec, self.path, repositories, more_spec)
-        self.specDigest = self.get_spec_digest(spec)
+        self.specDigest = specDigest or self.get_spec_digest(spec)
 
     def _find_repo(self):
         # check if this path exists in the repo
@@ -72,12 +129,13 @@ class Manifest(AttributeManager):
         return None
 
     def _load_spec(self, spec, path, repositories, more_spec):
+        # create a CommentedMap up front so we don't have to copy toscaDef below
         if "service_template" in spec:
-            toscaDef = spec["service_template"] or {}
+            toscaDef = spec["service_template"] or CommentedMap()
         elif "tosca" in spec:  # backward compat
-            toscaDef = spec["tosca"] or {}
+            toscaDef = spec["tosca"] or CommentedMap()
         else:
-            toscaDef = {}
+            toscaDef = CommentedMap()
 
         repositoriesTpl = toscaDef.setdefault("repositories", CommentedMap())
         for name, value in repositories.items():
@@ -91,7 +149,7 @@ class Manifest(AttributeManager):
             patch_dict(toscaDef, more_spec, True)
 
         if not isinstance(toscaDef, CommentedMap):
-            toscaDef = CommentedMap(toscaDef.items())
+            toscaDef = CommentedMap(toscaDef)
         if getattr(toscaDef, "base_dir", None) and (
             not path or toscaDef.base_dir != os.path.dirname(path)
         ):
@@ -100,6 +158,9 @@ class Manifest(AttributeManager):
         return ToscaSpec(toscaDef, spec, path, self.get_import_resolver(expand=True))
 
     def get_spec_digest(self, spec):
+        # note: this can't be replaced with the manifest's git blob id because
+        # it also covers imported types and nested templates
+        # (past revisions reuse the digest recorded in the job's changes instead)
         m = hashlib.sha1()  # use same digest function as git
         t = self.tosca.template
         for tpl in [spec, t.topology_template.custom_defs, t.nested_tosca_tpls]:
@@ -134,7 +195,11 @@ class Manifest(AttributeManager):
     def load_template(self, name, lastChange=None):
         if lastChange:
             try:
-                return self.revisions.get_revision(lastChange).tosca.get_template(name)
+                key = (lastChange["specDigest"], name)
+                if key not in self._templateCache:
+                    revision = self.revisions.get_revision(lastChange)
+                    self._templateCache[key] = revision.tosca.get_template(name)
+                return self._templateCache[key]
             except:
                 return None
         else:
@@ -144,42 +209,8 @@ class Manifest(AttributeManager):
     #    create a resource with the given template
     #  or generate a template setting interface with the referenced implementations
 
-    @staticmethod
-    def load_status(status, instance=None):
-        if not instance:
-            instance = OperationalInstance()
-        if not status:
-            return instance
-
-        instance._priority = to_enum(Priority, status.get("priority"))
-        instance._lastStateChange = status.get("lastStateChange")
-        instance._lastConfigChange = status.get("lastConfigChange")
-
-        readyState = status.get("readyState")
-        if not isinstance(readyState, Mapping):
-            instance._localStatus = to_enum(Status, readyState)
-        else:
-            instance._localStatus = to_enum(Status, readyState.get("local"))
-            instance._state = to_enum(NodeState, readyState.get("state"))
-
-        return instance
-
-    @staticmethod
-    def load_resource_changes(changes):
-        resourceChanges = ResourceChanges()
-        if changes:
-            for k, change in changes.items():
-                status = change.pop(".status", None)
-                if isinstance(status, dict):
-                    status = Manifest.load_status(status).local_status
-                else:
-                    status = to_enum(Status, status)
-                resourceChanges[k] = [
-                    status,
-                    change.pop(".added", None),
-                    change,
-                ]
-        return resourceChanges
+    load_status = staticmethod(_load_status)
+    load_resource_changes = staticmethod(_load_resource_changes)
 
     def load_config_change(self, changeSet):
         """
@@ -188,37 +219,29 @@ class Manifest(AttributeManager):
         from .configurator import Dependency
 
         configChange = ConfigChange()
-        Manifest.load_status(changeSet, configChange)
-        configChange.changeId = changeSet.get("changeId", 0)
-        configChange.previousId = changeSet.get("previousId")
-        configChange.target = changeSet.get("target")
-        configChange.operation = changeSet.get("implementation", {}).get("operation")
+        _load_status(changeSet, configChange)
+        get = changeSet.get
+        for key, default in _ChangeRecordAttributes:
+            setattr(configChange, key, get(key, default))
+        configChange.operation = get("implementation", {}).get("operation")
 
-        configChange.inputs = changeSet.get("inputs")
         # 'digestKeys', 'digestValue' but configurator can set more:
         for key in changeSet.keys():
             if key.startswith("digest"):
                 setattr(configChange, key, changeSet[key])
 
-        configChange.dependencies = []
-        for val in changeSet.get("dependencies", []):
-            configChange.dependencies.append(
-                Dependency(
-                    val["ref"],
-                    val.get("expected"),
-                    val.get("schema"),
-                    val.get("name"),
-                    val.get("required"),
-                    val.get("wantList", False),
-                )
+        configChange.dependencies = [
+            Dependency(
+                val["ref"],
+                *map(val.get, _DependencyFields),
+                val.get("wantList", False),
             )
+            for val in changeSet.get("dependencies", ())
+        ]
 
         if "changes" in changeSet:
-            configChange.resourceChanges = self.load_resource_changes(
-                changeSet["changes"]
-            )
+            configChange.resourceChanges = _load_resource_changes(changeSet["changes"])
 
-        configChange.result = changeSet.get("result")
         configChange.messages = changeSet.get("messages", [])
 
         # XXX
@@ -262,6 +285,20 @@ class Manifest(AttributeManager):
         return self._create_entity_instance(RelationshipInstance, key, val, capability)
 
     def create_node_instance(self, rname, resourceSpec, parent=None):
+        root = None
+        # walk the nested instances with a stack instead of recursing
+        stack = [(rname, resourceSpec, parent)]
+        while stack:
+            rname, resourceSpec, parent = stack.pop()
+            resource = self._create_node_instance(rname, resourceSpec, parent)
+            if root is None:
+                root = resource
+            # push in reverse so instances are created in the order they are declared
+            instances = list(resourceSpec.get("instances", {}).items())
+            stack.extend((key, val, resource) for key, val in reversed(instances))
+        return root
+
+    def _create_node_instance(self, rname, resourceSpec, parent):
         # if parent property is set it overrides the parent argument
         pname = resourceSpec.get("parent")
         if pname:
@@ -269,12 +306,11 @@ class Manifest(AttributeManager):
             if parent is None:
                 raise UnfurlError(f"can not find parent instance {pname}")
 
-        resource = self._create_entity_instance(
-            NodeInstance, rname, resourceSpec, parent
-        )
+        create = self._create_entity_instance
+        resource = create(NodeInstance, rname, resourceSpec, parent)
         if resourceSpec.get("capabilities"):
             for key, val in resourceSpec["capabilities"].items():
-                self._create_entity_instance(CapabilityInstance, key, val, resource)
+                create(CapabilityInstance, key, val, resource)
 
         if resourceSpec.get("requirements"):
             for req in resourceSpec["requirements"]:
@@ -285,10 +321,7 @@ class Manifest(AttributeManager):
 
         if resourceSpec.get("artifacts"):
             for key, val in resourceSpec["artifacts"].items():
-                self._create_entity_instance(ArtifactInstance, key, val, resource)
-
-        for key, val in resourceSpec.get("instances", {}).items():
-            self.create_node_instance(key, val, resource)
+                create(ArtifactInstance, key, val, resource)
 
         return resource
 
@@ -301,7 +334,7 @@ class Manifest(AttributeManager):
         return self.changeSets.get(jobId)
 
     def _create_entity_instance(self, ctor, name, status, parent):
-        operational = self.load_status(status)
+        operational = _load_status(status)
         templateName = status.get("template", name)
 
         imported = None
@@ -367,7 +400,7 @@ class Manifest(AttributeManager):
             return self.localEnv.find_path_in_repos(path, importLoader)
         elif self.repo:
             repo = self.repo
-            filePath = repo.findRepoPath(path)
+            filePath = repo.find_repo_path(path)
             if filePath is not None:
                 return repo, filePath, repo.revision, False
         return None, None, None, None
@@ -485,6 +518,7 @@ class Manifest(AttributeManager):
 
         inlineRepository = None
         if isinstance(templatePath, dict):
+            # copy because ArtifactSpec modifies it
             artifactTpl = templatePath.copy()
             path = artifactTpl["file"]
             repo = artifactTpl.get("repository")
@@ -496,6 +530,9 @@ class Manifest(AttributeManager):
 
                 inlineRepository = {reponame: repo}
         else:
+            # common case: a plain file path, which has no repository to check
+            if check:
+                return True
             artifactTpl = dict(file=templatePath)
 
         if check:
@@ -528,17 +565,25 @@ class Manifest(AttributeManager):
 
 
 class SnapShotManifest(Manifest):
-    def __init__(self, manifest, commitId):
+    def __init__(self, manifest, commitId, specDigest=None):
         super().__init__(manifest.path, self.localEnv)
         self.commitId = commitId
-        oldManifest = manifest.repo.show(manifest.path, commitId)
+        # stream the old version of the manifest from git instead of reading it into a string
+        gitShow = manifest.repo.show(manifest.path, commitId, as_process=True)
         self.repo = manifest.repo
         self.localEnv = manifest.localEnv
-        self.manifest = YamlConfig(
-            oldManifest, manifest.path, loadHook=self.load_yaml_include
-        )
-        self.update_repositories(oldManifest)
+        try:
+            self.manifest = YamlConfig(
+                gitShow.stdout, manifest.path, loadHook=self.load_yaml_include
+            )
+        finally:
+            # drain the pipe so git can exit, then reap it
+            # wait() raises git's error (if it failed) ahead of any parse error
+            gitShow.stdout.read()
+            gitShow.wait()
+        self.update_repositories(self.manifest.config)
         expanded = self.manifest.expanded
         # just needs the spec, not root resource
-        self._set_spec(expanded)
+        # the digest recorded with the commit saves us from hashing the whole spec again
+        self._set_spec(expanded, specDigest=specDigest)
         self._ready(None)
@@ -1,6 +1,6 @@
 # Copyright (c) 2020 Adam Souzis
 # SPDX-License-Identifier: MIT
-import itertools
+import functools
 import re
 import six
 from collections import namedtuple
@@ -60,6 +60,10 @@ def make_map_with_base(doc, baseDir):
     return factory
 
 
+# most maps are dicts (including CommentedMaps) so check for that before the slower ABC check
+# (only used where a map is the likely type, the tuple is slower for other types)
+_mappingTypes = (dict, Mapping)
+
 # XXX?? because json keys are strings allow number keys to merge with lists
 # other values besides delete not supported because current code can leave those keys in final result
 mergeStrategyKey = "+%"  # supported values: "whiteout", "nullout"
@@ -81,7 +85,9 @@ def merge_dicts(
     """
     cls = getattr(b, "mapCtor", cls or b.__class__)
     cp = cls()
-    skip = []
+    skip = set()
+    # membership tests on CommentedMaps are much slower than on sets
+    bKeys = set(b)
     for key, val in a.items():
         if key == mergeStrategyKey:
             continue
@@ -92,9 +98,9 @@ def merge_dicts(
         # note: for merging treat None as an empty map
         if isinstance(val, Mapping) or val is None:
             strategy = val and val.get(mergeStrategyKey)
-            if key in b:
+            if key in bKeys:
                 bval = b[key]
-                if isinstance(bval, Mapping):
+                if isinstance(bval, _mappingTypes):
                     # merge strategy of a overrides b
                     if not strategy:
                         strategy = bval.get(mergeStrategyKey) or defaultStrategy
@@ -115,11 +121,11 @@ def merge_dicts(
                         )
                 # otherwise we ignore bval because key is already in a
             if strategy == "whiteout":
-                skip.append(key)
+                skip.add(key)
                 continue
             if strategy == "nullout":
                 val = None
-        elif isinstance(val, MutableSequence) and key in b:
+        elif isinstance(val, MutableSequence) and key in bKeys:
             bval = b[key]
             if isinstance(bval, MutableSequence) and listStrategy == "append_unique":
                 # XXX allow more strategies beyond append
@@ -140,10 +146,10 @@ def merge_dicts(
         cp[key] = val
 
     # add new keys
+    skip.add(mergeStrategyKey)
+    skip.update(cp)
     for key, val in b.items():
-        if key == mergeStrategyKey:
-            continue
-        if key not in cp and key not in skip:
+        if key not in skip:
             # note: val is shared not copied
             cp[key] = val
     return cp
@@ -196,7 +202,8 @@ def _json_pointer_validate(pointer):
     return None
 
 
-def get_template(doc, key, value, path, cls, includes=None):
+def get_template(doc, key, value, path, cls, includes=None, found=None):
+    # found is the (truthy) value returned by has_template() for the same arguments
     template = doc
     templatePath = None
     if key.include:
@@ -207,7 +214,7 @@ def get_template(doc, key, value, path, cls, includes=None):
         # fileKey = key._replace(include=None)
         # template = getTemplate(template, fileKey, "raw", (), cls)
     else:
-        result = _find_template(doc, key, path, cls, not key.maybe)
+        result = found or _find_template(doc, key, path, cls, not key.maybe)
         if result is None:
             return doc
         template, templatePath = result
@@ -222,15 +229,12 @@ def get_template(doc, key, value, path, cls, includes=None):
             # if the include path starts with the path to the template
             # throw recursion error
             if not key.include and not key.anchor:
-                prefix = list(
-                    itertools.takewhile(lambda x: x[0] == x[1], zip(path, templatePath))
-                )
-                if len(prefix) == len(templatePath):
+                if tuple(path[: len(templatePath)]) == tuple(templatePath):
                     raise UnfurlError(
                         f'recursive include "{templatePath}" in "{path}" when including {key.key}'
                     )
             if includes is None:
-                includes = CommentedMap()
+                includes = {}
             template = expand_dict(doc, path, includes, template, cls=cls)
     finally:
         if key.include:
@@ -285,12 +289,17 @@ def _find_template(doc, key, path, cls, fail):
 
 
 def has_template(doc, key, value, path, cls):
+    """
+    Returns a truthy value if the template exists.
+    If it's not an include this is the result of the lookup,
+    which can be passed to get_template() to avoid looking it up again.
+    """
     if key.include:
         loadTemplate = getattr(doc, "loadTemplate", None)
         if not loadTemplate:
             return False
         return doc.loadTemplate(value, key.maybe, doc, True)
-    return _find_template(doc, key, path, cls, False) is not None
+    return _find_template(doc, key, path, cls, False)
 
 
 class _MissingInclude:
@@ -308,6 +317,8 @@ RE_FIRST = re.compile(r"([?]?)(include\d*)?([*]\S+)?([.]+$)?")
 MergeKey = namedtuple("MergeKey", "key, maybe, include, anchor, relative, pointer")
 
 
+# the same keys are parsed again each time a document is expanded
+@functools.lru_cache(maxsize=4096, typed=True)
 def parse_merge_key(key):
     """
     +[maybe]?[include]?[anchor]?[relative]?[jsonpointer]?
@@ -350,7 +361,7 @@ def expand_dict(doc, path, includes, current, cls=dict):
     cp = cls()
     # first merge any includes includes into cp
     templates = []
-    assert isinstance(current, Mapping), current
+    assert isinstance(current, _mappingTypes), current
     for (key, value) in current.items():
         if not isinstance(key, six.string_types):
             cp[key] = value
@@ -369,8 +380,10 @@ def expand_dict(doc, path, includes, current, cls=dict):
                 cp[key] = value
                 continue
             includes.setdefault(path, []).append((mergeKey, value))
-            template = get_template(doc, mergeKey, value, path, cls, includes)
-            if isinstance(template, Mapping):
+            template = get_template(
+                doc, mergeKey, value, path, cls, includes, foundTemplate
+            )
+            if isinstance(template, _mappingTypes):
                 templates.append(template)
             elif mergeKey.include and template is None:
                 continue  # include path not found
@@ -386,7 +399,7 @@ def expand_dict(doc, path, includes, current, cls=dict):
         elif isinstance(value, Mapping):
             cp[key] = expand_dict(doc, path + (key,), includes, value, cls)
         elif isinstance(value, list):
-            cp[key] = list(expand_list(doc, path + (key,), includes, value, cls))
+            cp[key] = expand_list(doc, path + (key,), includes, value, cls)
         else:
             cp[key] = value
 
@@ -411,7 +424,9 @@ def _find_missing_includes(includes):
 
 
 def _delete_deleted_keys(expanded):
-    for key, value in expanded.items():
+    # note: this modifies expanded in place, which is safe because expand_dict() copies
+    # every map it expands, so subtrees can't be shared with the original document
+    for key, value in list(expanded.items()):
         if isinstance(value, Mapping):
             if value.get(mergeStrategyKey) == "whiteout":
                 del expanded[key]
@@ -420,10 +435,11 @@ def _delete_deleted_keys(expanded):
 
 
 def expand_doc(doc, current=None, cls=dict):
-    includes = CommentedMap()
+    # includes is only used internally (its keys are path tuples) so it can be a plain dict
+    includes = {}
     if current is None:
         current = doc
-    if not isinstance(doc, Mapping) or not isinstance(current, Mapping):
+    if not isinstance(doc, _mappingTypes) or not isinstance(current, _mappingTypes):
         raise UnfurlError(f"top level element {doc} is not a dict")
     expanded = expand_dict(doc, (), includes, current, cls)
     if hasattr(doc, "_anchorCache"):
@@ -438,25 +454,26 @@ def expand_doc(doc, current=None, cls=dict):
         if len(missing) == last:  # no progress
             raise UnfurlError(f"missing includes: {missing}")
         last = len(missing)
-        includes = CommentedMap()
+        includes = {}
         expanded = expand_dict(expanded, (), includes, current, cls)
         if hasattr(doc, "_anchorCache"):
             expanded._anchorCache = doc._anchorCache
 
 
 def expand_list(doc, path, includes, value, cls=dict):
+    expanded = []
     for i, item in enumerate(value):
-        if isinstance(item, Mapping):
+        if isinstance(item, _mappingTypes):
             if item.get(mergeStrategyKey) == "whiteout":
                 continue
             newitem = expand_dict(doc, path + (i,), includes, item, cls)
             if isinstance(newitem, MutableSequence):
-                for i in newitem:
-                    yield i
+                expanded.extend(newitem)
             else:
-                yield newitem
+                expanded.append(newitem)
         else:
-            yield item
+            expanded.append(item)
+    return expanded
 
 
 def diff_dicts(old, new, cls=dict):
@@ -464,9 +481,10 @@ def diff_dicts(old, new, cls=dict):
     given old, new return diff where merge_dicts(old, diff) == new
     """
     diff = cls()
+    newKeys = set(new)
     # start with old to preserve original order
     for key, oldval in old.items():
-        if key in new:
+        if key in newKeys:
             newval = new[key]
             if oldval != newval:
                 if isinstance(oldval, Mapping):
@@ -482,8 +500,9 @@ def diff_dicts(old, new, cls=dict):
         else:  # not in new, so add a whiteout directive to delete this key
             diff[key] = cls((("+%", "whiteout"),))
 
+    oldKeys = set(old)
     for key in new:
-        if key not in old:
+        if key not in oldKeys:
             diff[key] = new[key]
     return diff
 
@@ -495,9 +514,10 @@ def patch_dict(old, new, preserve=False):
 
     If ``preserve`` is True ``new`` will be merged in without removing ``old`` items.
     """
+    newKeys = set(new)
     # start with old to preserve original order
     for key, val in list(old.items()):
-        if key in new:
+        if key in newKeys:
             newval = new[key]
             if val != newval:
                 if isinstance(val, Mapping) and isinstance(newval, Mapping):
@@ -519,8 +539,9 @@ def patch_dict(old, new, preserve=False):
         elif not preserve:
             del old[key]
 
+    oldKeys = set(old)
     for key in new:
-        if key not in old:
+        if key not in oldKeys:
             old[key] = new[key]
 
     return old
@@ -530,9 +551,10 @@ def intersect_dict(old, new, cls=dict):
     """
     remove keys from old that don't match new
     """
+    newKeys = set(new)
     # start with old to preserve original order
     for key, val in list(old.items()):
-        if key in new:
+        if key in newKeys:
             newval = new[key]
             if val != newval:
                 if isinstance(val, Mapping) and isinstance(newval, Mapping):
@@ -548,15 +570,18 @@ def intersect_dict(old, new, cls=dict):
 def lookup_path(doc, path, cls=dict):
     template = doc
     for segment in path:
-        if isinstance(template, Sequence):
-            try:
-                segment = int(segment)
-            except ValueError:
-                return None
         try:
             template = template[segment]
-        except (TypeError, LookupError):
+        except LookupError:
             return None
+        except TypeError:
+            # only convert the segment to an index when the plain lookup fails
+            if not isinstance(template, Sequence):
+                return None
+            try:
+                template = template[int(segment)]
+            except (ValueError, TypeError, LookupError):
+                return None
     return template
 
 
@@ -608,11 +633,19 @@ def restore_includes(includes, originalDoc, changedDoc, cls=dict):
                 changedDoc, includeKey, includeValue, key, cls
             )
             if stillHasTemplate:
-                template = get_template(changedDoc, includeKey, includeValue, key, cls)
+                template = get_template(
+                    changedDoc,
+                    includeKey,
+                    includeValue,
+                    key,
+                    cls,
+                    found=stillHasTemplate,
+                )
             else:
-                if has_template(originalDoc, includeKey, includeValue, key, cls):
+                found = has_template(originalDoc, includeKey, includeValue, key, cls)
+                if found:
                     template = get_template(
-                        originalDoc, includeKey, includeValue, key, cls
+                        originalDoc, includeKey, includeValue, key, cls, found=found
                     )
                 else:
                     template = get_template(
@@ -636,9 +669,10 @@ def restore_includes(includes, originalDoc, changedDoc, cls=dict):
 
             if not stillHasTemplate:
                 if includeValue != "raw":
-                    if has_template(originalDoc, includeKey, includeValue, key, cls):
+                    # originalDoc isn't modified so reuse the lookup from above
+                    if found:
                         template = get_template(
-                            originalDoc, includeKey, "raw", key, cls
+                            originalDoc, includeKey, "raw", key, cls, found=found
                         )
                     else:
                         template = get_template(
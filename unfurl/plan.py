@@ -121,7 +121,7 @@ class Plan:
         self.root.imports[name] = shadowInstance
         return shadowInstance
 
-    def find_resources_from_template(self, template):
+    def find_resources_from_template(self, template, instancesByTemplate=None):
         if template.abstract == "select":
             # XXX also match node_filter if present
             shadowInstance = self.find_shadow_instance(template)
@@ -132,6 +132,8 @@ class Plan:
                     "could not find external instance for template %s", template.name
                 )
             # XXX also yield newly created parents that needed to be checked?
+        elif instancesByTemplate is not None:
+            yield from instancesByTemplate.get(template.name, ())
         else:
             for resource in find_resources_from_template_name(self.root, template.name):
                 yield resource
@@ -458,10 +460,17 @@ class Plan:
         templates = self._get_templates()
 
         logger.debug("checking for tasks for templates %s", [t.name for t in templates])
+        # index the existing instances once instead of searching the whole tree per template
+        # (instances created below are for templates that had no instances)
+        instancesByTemplate = {}
+        for instance in self.root.get_self_and_descendents():
+            instancesByTemplate.setdefault(instance.template.name, []).append(instance)
         visited = set()
         for template in templates:
             found = False
-            for resource in self.find_resources_from_template(template):
+            for resource in self.find_resources_from_template(
+                template, instancesByTemplate
+            ):
                 found = True
                 visited.add(id(resource))
                 yield from self._generate_workflow_configurations(resource, template)
@@ -509,11 +518,13 @@ class DeployPlan(Plan):
         if jobOptions.force:
             return Reason.force
 
-        if jobOptions.add and not jobOptions.skip_new and instance.status != Status.ok:
+        # status is computed from the instance's dependencies so only evaluate it once
+        status = instance.status
+        if jobOptions.add and not jobOptions.skip_new and status != Status.ok:
             if not instance.last_change:  # never instantiated before
                 return Reason.add
 
-            if instance.status in [Status.unknown, Status.pending, Status.absent]:
+            if status in (Status.unknown, Status.pending, Status.absent):
                 return Reason.missing
 
         # if the specification changed:
@@ -527,7 +538,7 @@ class DeployPlan(Plan):
                 elif jobOptions.upgrade:
                     return Reason.upgrade
 
-        reason = self.check_for_repair(instance)
+        reason = self.check_for_repair(instance, status)
         # there isn't a new config to run, see if the last applied config needs to be re-run
         if (
             not reason
@@ -538,20 +549,21 @@ class DeployPlan(Plan):
             return Reason.reconfigure
         return reason
 
-    def check_for_repair(self, instance):
+    def check_for_repair(self, instance, status=None):
         jobOptions = self.jobOptions
         assert instance
         if jobOptions.repair == "none":
             return None
-        status = instance.status
+        if status is None:
+            status = instance.status
 
-        if status in [Status.unknown, Status.pending]:
+        if status in (Status.unknown, Status.pending):
             if instance.required:
                 status = Status.error  # treat as error
             else:
                 return None
 
-        if status not in [Status.degraded, Status.error]:
+        if status not in (Status.degraded, Status.error):
             return None
 
         if jobOptions.repair == "degraded":
@@ -777,14 +789,21 @@ def get_ancestor_templates(source):
 
 
 def get_operational_dependents(resource, seen=None):
+    # depth-first, yielding each dependent after its own dependents
+    # (uses an explicit stack instead of recursive generators)
     if seen is None:
         seen = set()
-    for dep in resource.get_operational_dependents():
-        if id(dep) not in seen:
-            seen.add(id(dep))
-            for child in get_operational_dependents(dep, seen):
-                yield child
-            yield dep
+    stack = [(resource, iter(resource.get_operational_dependents()))]
+    while stack:
+        for dep in stack[-1][1]:
+            if id(dep) not in seen:
+                seen.add(id(dep))
+                stack.append((dep, iter(dep.get_operational_dependents())))
+                break
+        else:
+            dep = stack.pop()[0]
+            if stack:  # don't yield the starting resource
+                yield dep
 
 
 # XXX!:
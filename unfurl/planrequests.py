@@ -107,6 +107,8 @@ class ConfigurationSpec:
         return ConfigurationSpec(**args)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, ConfigurationSpec):
             return False
         return (
@@ -409,6 +411,8 @@ def _get_deps(parent, req, liveDependencies, requests):
 def set_fulfilled(requests, completed):
     # requests, completed are top level requests,
     # as is future_dependencies
+    # requests compare by identity so use a set for the membership tests
+    completed = set(completed)
     ready, notReady = [], []
     for req in requests:
         if req.update_future_dependencies(completed):
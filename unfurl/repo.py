@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 import os
 import os.path
+from collections import OrderedDict
 from pathlib import Path
 import git
 from git.repo.fun import is_git_dir
@@ -446,14 +447,18 @@ class GitRepo(Repo):
         with open(os.path.join(self.repo.git_dir, "info", "exclude"), "a") as f:
             f.write("\n" + rule + "\n")
 
-    def show(self, path, commitId):
+    def show(self, path, commitId, **kw):
+        """
+        Returns the contents of ``path`` at ``commitId``.
+        Pass ``as_process=True`` to read the contents from the returned process' stdout instead.
+        """
         if self.working_dir and os.path.isabs(path):
             path = os.path.abspath(path)[len(self.working_dir) :]
         # XXX this won't work if path is in a submodule
         # if in path startswith a submodule: git log -1 -p [commitid] --  [submodule]
         # submoduleCommit = re."\+Subproject commit (.+)".group(1)
         # return self.repo.submodules[submodule].git.show(submoduleCommit+':'+path[len(submodule)+1:])
-        return self.repo.git.show(commitId + ":" + path)
+        return self.repo.git.show(commitId + ":" + path, **kw)
 
     def checkout(self, revision=""):
         # if revision isn't specified and repo is not pinned:
@@ -554,21 +559,33 @@ class GitRepo(Repo):
 
 
 class RevisionManager:
-    def __init__(self, manifest, localEnv=None):
+    """
+    Loads past versions of the manifest's spec.
+    The most recently used snapshots are kept in a LRU cache keyed by spec digest.
+    """
+
+    maxSnapshots = 4
+
+    def __init__(self, manifest, localEnv=None, maxSnapshots=None):
         self.manifest = manifest
-        self.revisions = None
+        self.revisions = OrderedDict()
         self.localEnv = localEnv
+        if maxSnapshots is not None:
+            self.maxSnapshots = maxSnapshots
 
     def get_revision(self, change):
-        if self.revisions is None:
-            self.revisions = {self.manifest.specDigest: self.manifest}
         digest = change["specDigest"]
-        commitid = change["startCommit"]
+        if digest == self.manifest.specDigest:
+            return self.manifest
         if digest in self.revisions:
+            self.revisions.move_to_end(digest)
             return self.revisions[digest]
         else:
             from .manifest import SnapShotManifest
 
-            manifest = SnapShotManifest(self.manifest, commitid)
+            commitid = change["startCommit"]
+            manifest = SnapShotManifest(self.manifest, commitid, digest)
             self.revisions[digest] = manifest
+            if len(self.revisions) > self.maxSnapshots:
+                self.revisions.popitem(last=False)
             return manifest
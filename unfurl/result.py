@@ -110,7 +110,10 @@ class ResourceRef:
 
     @property
     def root(self):
-        return self.ancestors[-1]
+        resource = self
+        while resource.parent:
+            resource = resource.parent
+        return resource
 
     @property
     def all(self):
@@ -264,6 +267,8 @@ class ChangeRecord:
 
 
 class ChangeAware:
+    __slots__ = ()
+
     def has_changed(self, changeRecord):
         """
         Whether or not this object changed since the give ChangeRecord.
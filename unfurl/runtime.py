@@ -37,6 +37,8 @@ class Operational(ChangeAware):
     and all use the same algorithm to compute their status from their dependent resouces, tasks, and configurations
     """
 
+    __slots__ = ()
+
     # XXX3 add repairable, messages?
 
     # core properties to override
@@ -93,8 +95,8 @@ class Operational(ChangeAware):
         Otherwise the local_status is compared with its aggregate dependent status
         and worser value is choosen.
         """
-        if self.manual_overide_status is not None:
-            status = self.manual_overide_status
+        status = self.manual_overide_status
+        if status is not None:
             if status >= Status.error:
                 return status
         else:
@@ -170,23 +172,36 @@ class Operational(ChangeAware):
 
         # any required is pending then aggregate is pending
         # otherwise just set to degraded
+        # enum member lookups are relatively slow so bind the ones used in the loop
+        ok, degraded, pending = Status.ok, Status.degraded, Status.pending
+        ignore, requiredPriority = Priority.ignore, Priority.required
         aggregate = None
-        for status in statuses:
-            assert isinstance(status, Operational), status
+        for dependency in statuses:
+            assert isinstance(dependency, Operational), dependency
             if aggregate is None:
-                aggregate = Status.ok
-            if status.priority == Priority.ignore:
+                aggregate = ok
+            priority = dependency.priority
+            if priority == ignore:
+                continue
+            required = priority == requiredPriority
+            if not required and aggregate != ok:
+                # an optional dependency can only lower an ok aggregate to degraded
+                # so skip computing its status
                 continue
-            elif status.required and not status.operational:
-                if status.status == Status.pending:
-                    aggregate = Status.pending
+            # status is computed recursively from the dependency's own dependencies
+            # so only evaluate it once (the operational property would evaluate it again)
+            status = dependency.status
+            operational = status == ok or status == degraded
+            if required and not operational:
+                if status == pending:
+                    aggregate = pending
                 else:
                     aggregate = Status.error
                     break
             else:
-                if aggregate <= Status.degraded:
-                    if not status.operational or status.status == Status.degraded:
-                        aggregate = Status.degraded
+                if aggregate <= degraded:
+                    if not operational or status == degraded:
+                        aggregate = degraded
         return aggregate
 
 
@@ -195,6 +210,17 @@ class OperationalInstance(Operational):
     A concrete implementation of Operational
     """
 
+    # plain OperationalInstances are created for every status loaded so avoid a __dict__
+    __slots__ = (
+        "_localStatus",
+        "_manualOverideStatus",
+        "_priority",
+        "_lastStateChange",
+        "_lastConfigChange",
+        "_state",
+        "dependencies",
+    )
+
     def __init__(
         self,
         status=None,
@@ -226,53 +252,44 @@ class OperationalInstance(Operational):
     def get_operational_dependencies(self):
         return self.dependencies
 
-    def local_status():
-        doc = "The local_status property."
-
-        def fget(self):
-            return self._localStatus
-
-        def fset(self, value):
-            self._localStatus = value
-
-        def fdel(self):
-            del self._localStatus
-
-        return locals()
-
-    local_status = property(**local_status())
-
-    def manual_overide_status():
-        doc = "The manualOverideStatus property."
-
-        def fget(self):
-            return self._manualOverideStatus
-
-        def fset(self, value):
-            self._manualOverideStatus = value
-
-        def fdel(self):
-            del self._manualOverideStatus
+    @property
+    def local_status(self):
+        "The local_status property."
+        return self._localStatus
 
-        return locals()
+    @local_status.setter
+    def local_status(self, value):
+        self._localStatus = value
 
-    manual_overide_status = property(**manual_overide_status())
+    @local_status.deleter
+    def local_status(self):
+        del self._localStatus
 
-    def priority():
-        doc = "The priority property."
+    @property
+    def manual_overide_status(self):
+        "The manualOverideStatus property."
+        return self._manualOverideStatus
 
-        def fget(self):
-            return Defaults.shouldRun if self._priority is None else self._priority
+    @manual_overide_status.setter
+    def manual_overide_status(self, value):
+        self._manualOverideStatus = value
 
-        def fset(self, value):
-            self._priority = value
+    @manual_overide_status.deleter
+    def manual_overide_status(self):
+        del self._manualOverideStatus
 
-        def fdel(self):
-            del self._priority
+    @property
+    def priority(self):
+        "The priority property."
+        return Defaults.shouldRun if self._priority is None else self._priority
 
-        return locals()
+    @priority.setter
+    def priority(self, value):
+        self._priority = value
 
-    priority = property(**priority())
+    @priority.deleter
+    def priority(self):
+        del self._priority
 
     @property
     def last_state_change(self):
@@ -282,18 +299,14 @@ class OperationalInstance(Operational):
     def last_config_change(self):
         return self._lastConfigChange
 
-    def state():
-        doc = "The state property."
-
-        def fget(self):
-            return self._state
-
-        def fset(self, value):
-            self._state = to_enum(NodeState, value)
-
-        return locals()
+    @property
+    def state(self):
+        "The state property."
+        return self._state
 
-    state = property(**state())
+    @state.setter
+    def state(self, value):
+        self._state = to_enum(NodeState, value)
 
 
 class _ChildResources(Mapping):
@@ -343,30 +356,28 @@ class EntityInstance(OperationalInstance, ResourceRef):
 
         return Ref(expr).resolve(RefContext(self, vars=vars), wantList)
 
-    def local_status():
-        doc = "The working_dir property."
-
-        def fget(self):
-            return self._localStatus
-
-        def fset(self, value):
-            if self.root.attributeManager:
-                self.root.attributeManager.set_status(self, value)
-            self._localStatus = value
-
-        def fdel(self):
-            del self._localStatus
+    @property
+    def local_status(self):
+        "The local_status property."
+        return self._localStatus
 
-        return locals()
+    @local_status.setter
+    def local_status(self, value):
+        if self.root.attributeManager:
+            self.root.attributeManager.set_status(self, value)
+        self._localStatus = value
 
-    local_status = property(**local_status())
+    @local_status.deleter
+    def local_status(self):
+        del self._localStatus
 
     def get_operational_dependencies(self):
-        if self.parent and self.parent is not self.root:
-            yield self.parent
+        parent = self.parent
+        # the parent is a dependency unless it is the root
+        if parent and parent.parent:
+            yield parent
 
-        for d in self.dependencies:
-            yield d
+        yield from self.dependencies
 
     @property
     def key(self):
@@ -445,7 +456,13 @@ class EntityInstance(OperationalInstance, ResourceRef):
             state["_interfaces"] = {}
         if "attributeManager" in state:
             del state["attributeManager"]
-        return state
+        # OperationalInstance's attributes are stored in slots, not in __dict__
+        slots = {
+            name: getattr(self, name)
+            for name in OperationalInstance.__slots__
+            if hasattr(self, name)
+        }
+        return state, slots
 
     def __repr__(self):
         return f"{self.__class__}('{self.name}')"
@@ -558,8 +575,7 @@ class ArtifactInstance(EntityInstance):
 
     def get_operational_dependencies(self):
         # skip dependency on the parent
-        for d in self.dependencies:
-            yield d
+        return iter(self.dependencies)
 
 
 class NodeInstance(EntityInstance):
@@ -584,9 +600,14 @@ class NodeInstance(EntityInstance):
         self.instances = []
         EntityInstance.__init__(self, name, attributes, parent, template, status)
 
-        if self.root is self:
+        root = self.root
+        if root is self:
             self._all = _ChildResources(self)
             self._templar = Templar(DataLoader())
+            # index of node instances by name (node instances names are unique)
+            self._instancesByName = {name: self}
+        else:
+            root._instancesByName[name] = self
 
         self._interfaces = {}
         # preload
@@ -730,8 +751,7 @@ class NodeInstance(EntityInstance):
         return f"::{self.name}"
 
     def get_operational_dependencies(self):
-        for dep in super().get_operational_dependencies():
-            yield dep
+        yield from super().get_operational_dependencies()
 
         for instance in self.requirements:
             if instance is not self.parent:
@@ -753,10 +773,13 @@ class NodeInstance(EntityInstance):
 
     def get_self_and_descendents(self):
         "Recursive descendent including self"
-        yield self
-        for r in self.instances:
-            for descendent in r.get_self_and_descendents():
-                yield descendent
+        # walk the tree with an explicit stack instead of nested generators
+        # so each instance is yielded directly instead of through every ancestor
+        stack = [self]
+        while stack:
+            instance = stack.pop()
+            yield instance
+            stack.extend(reversed(instance.instances))
 
     @property
     def descendents(self):
@@ -764,12 +787,14 @@ class NodeInstance(EntityInstance):
 
     # XXX use find_instance instead and remove find_resource
     def find_resource(self, resourceid):
-        if self.name == resourceid:
-            return self
-        for r in self.instances:
-            child = r.find_resource(resourceid)
-            if child:
-                return child
+        root = self.root
+        instance = root._instancesByName.get(resourceid)
+        if instance is None or root is self:
+            return instance
+        # only return the instance if it is self or one of self's descendents
+        for ancestor in instance.yield_parents():
+            if ancestor is self:
+                return instance
         return None
 
     find_instance = find_resource
@@ -857,8 +882,7 @@ class TopologyInstance(NodeInstance):
         ]
 
     def get_operational_dependencies(self):
-        for instance in self.instances:
-            yield instance
+        return iter(self.instances)
 
     @property
     def tmp_dir(self):
@@ -863,20 +863,25 @@ class AttributeManager:
         state["_yaml"] = None
         return state
 
+    # note: resource.key is computed on each access so only look it up once
     def get_status(self, resource):
-        if resource.key not in self.statuses:
+        status = self.statuses.get(resource.key)
+        if status is None:
             return resource._localStatus, resource._localStatus
-        return self.statuses[resource.key]
+        return status
 
     def set_status(self, resource, newvalue):
         assert newvalue is None or isinstance(newvalue, Status)
-        if resource.key not in self.statuses:
-            self.statuses[resource.key] = [resource._localStatus, newvalue]
+        key = resource.key
+        if key not in self.statuses:
+            self.statuses[key] = [resource._localStatus, newvalue]
         else:
-            self.statuses[resource.key][1] = newvalue
+            self.statuses[key][1] = newvalue
 
     def get_attributes(self, resource):
-        if resource.key not in self.attributes:
+        key = resource.key
+        found = self.attributes.get(key)
+        if found is None:
             # deepcopy() because lazily created ResultMaps and ResultLists will mutate
             # the underlying nested structures when resolving values
             if resource.template:
@@ -897,10 +902,10 @@ class AttributeManager:
                 )
             ctx = RefContext(resource, vars)
             attributes = ResultsMap(_attributes, ctx)
-            self.attributes[resource.key] = (resource, attributes)
+            self.attributes[key] = (resource, attributes)
             return attributes
         else:
-            return self.attributes[resource.key][1]
+            return found[1]
 
     # def revertChanges(self):
     #   self.attributes = {}
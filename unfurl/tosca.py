@@ -354,7 +354,10 @@ class ToscaSpec:
             return None
 
     def get_template(self, name):
-        if name == "~topology":
+        if "~" not in name:
+            # fast path for the common case of a node template name
+            return self.nodeTemplates.get(name)
+        elif name == "~topology":
             return self.topology
         elif "~c~" in name:
             nodeName, capability = name.split("~c~")
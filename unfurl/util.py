@@ -261,8 +261,11 @@ def lookup_class(kind, apiVersion=None, default=None):
 
 def to_enum(enum, value, default=None):
     # from string: Status[name]; to string: status.name
-    if isinstance(value, six.string_types):
+    if isinstance(value, str):
         return enum[value]
+    elif isinstance(value, enum):
+        # already converted, skip the EnumMeta.__call__ round trip below
+        return value
     elif default is not None and not value:
         return default
     elif isinstance(value, int):
@@ -401,14 +404,29 @@ def extend_with_default(validator_class):
     assert obj == {'foo': 'bar'}
     """
     validate_properties = validator_class.VALIDATORS["properties"]
+    # id(properties) => (properties, defaults)
+    defaultsCache = {}
+
+    def get_defaults(properties):
+        cached = defaultsCache.get(id(properties))
+        if cached is not None and cached[0] is properties:
+            return cached[1]
+        defaults = {
+            key: subschema["default"]
+            for key, subschema in properties.items()
+            if "default" in subschema
+        }
+        if len(defaultsCache) >= 512:
+            defaultsCache.clear()
+        defaultsCache[id(properties)] = (properties, defaults)
+        return defaults
 
     def set_defaults(validator, properties, instance, schema):
         if not validator.is_type(instance, "object"):
             return
 
-        for key, subschema in properties.items():
-            if "default" in subschema:
-                instance.setdefault(key, subschema["default"])
+        for key, default in get_defaults(properties).items():
+            instance.setdefault(key, default)
 
         for error in validate_properties(validator, properties, instance, schema):
             yield error
@@ -426,14 +444,31 @@ def validate_schema(obj, schema, baseUri=None):
     return not find_schema_errors(obj, schema)
 
 
-def find_schema_errors(obj, schema, baseUri=None):
-    # XXX2 have option that includes definitions from manifest's schema
+# keyed by (id(schema), baseUri), values keep a reference to the schema
+# so its id can't be reused while the entry is cached
+_validatorCache = {}
+
+
+def _get_validator(schema, baseUri=None):
+    key = (id(schema), baseUri)
+    cached = _validatorCache.get(key)
+    if cached is not None and cached[0] is schema:
+        return cached[1]
     if baseUri is not None:
         resolver = RefResolver(base_uri=baseUri, referrer=schema)
     else:
         resolver = None
     DefaultValidatingLatestDraftValidator.check_schema(schema)
     validator = DefaultValidatingLatestDraftValidator(schema, resolver=resolver)
+    if len(_validatorCache) >= 512:
+        _validatorCache.clear()
+    _validatorCache[key] = (schema, validator)
+    return validator
+
+
+def find_schema_errors(obj, schema, baseUri=None):
+    # XXX2 have option that includes definitions from manifest's schema
+    validator = _get_validator(schema, baseUri)
     errors = list(validator.iter_errors(obj))
     error = jsonschema.exceptions.best_match(errors)
     if not error:
@@ -19,7 +19,7 @@ from jsonschema import RefResolver
 from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap
 from ruamel.yaml.representer import RepresenterError, SafeRepresenter
-from ruamel.yaml.constructor import ConstructorError
+from ruamel.yaml.constructor import ConstructorError, SafeConstructor
 
 from .util import (
     to_bytes,
@@ -159,6 +159,43 @@ def make_yaml(vault=None):
     return yaml
 
 
+class _VaultSafeConstructor(SafeConstructor):
+    pass
+
+
+_VaultSafeConstructor.add_constructor("!vault", construct_vault)
+_VaultSafeConstructor.add_constructor("!vault-json", construct_vaultjson)
+_VaultSafeConstructor.add_constructor("!vault-binary", construct_vaultbinary)
+
+
+_emptyVault = VaultLib(secrets=None)
+# id(vault) => (vault, YAML)
+_readonlyYamlCache = {}
+
+
+def make_readonly_yaml(vault=None):
+    """
+    Returns a YAML loader that uses the libyaml-based C parser when it is available.
+    It doesn't preserve comments or formatting so only use it for documents that won't be saved.
+    It also drops anchors, so don't use it for documents with ``+*anchor`` merge keys.
+    """
+    if not vault:
+        vault = _emptyVault
+    cached = _readonlyYamlCache.get(id(vault))
+    if cached is not None and cached[0] is vault:
+        return cached[1]
+    yaml = YAML(typ="safe")
+    # with libyaml, ruamel builds its own loader class that derives from
+    # yaml.Constructor, so set the vault on the class, not on yaml.constructor
+    yaml.Constructor = type(
+        "_VaultSafeConstructor", (_VaultSafeConstructor,), dict(vault=vault)
+    )
+    if len(_readonlyYamlCache) >= 64:
+        _readonlyYamlCache.clear()
+    _readonlyYamlCache[id(vault)] = (vault, yaml)
+    return yaml
+
+
 yaml = make_yaml()
 cleartext_yaml = make_yaml(CLEARTEXT_VAULT)
 
@@ -183,6 +220,9 @@ def make_vault_lib_ex(secrets: [str, Union[str, bytes]]):
 
 _refResolver = RefResolver("", None)
 
+# schema file path => parsed schema, so find_schema_errors can reuse its validator
+_schemaCache = {}
+
 
 class ImportResolver(toscaparser.imports.ImportResolver):
     def __init__(self, manifest, ignoreFileNotFound=False, expand=False):
@@ -337,16 +377,19 @@ class YamlConfig:
         schema=None,
         loadHook=None,
         vault=None,
+        readonly=False,
     ):
         try:
             self._yaml = None
             self.vault = vault
+            self.readonly = readonly
             self.path = None
             self.schema = schema
             self.lastModified = None
             if path:
                 self.path = os.path.abspath(path)
-                if os.path.isfile(self.path):
+                # a stream overrides the file, otherwise config is the default
+                if not hasattr(config, "read") and os.path.isfile(self.path):
                     statinfo = os.stat(self.path)
                     self.lastModified = statinfo.st_mtime
                     with open(self.path, "r") as f:
@@ -355,12 +398,17 @@ class YamlConfig:
             else:
                 self.path = None
 
-            if isinstance(config, six.string_types):
-                if self.path:
+            if isinstance(config, six.string_types) or hasattr(config, "read"):
+                if self.path and isinstance(config, six.string_types):
                     # set name on a StringIO so parsing error messages include the path
                     config = six.StringIO(config)
                     config.name = self.path
-                self.config = self.yaml.load(config)
+                if readonly:
+                    self.config = make_readonly_yaml(self.vault).load(config)
+                    if isinstance(self.config, dict):
+                        self.config = CommentedMap(self.config.items())
+                else:
+                    self.config = self.yaml.load(config)
             elif isinstance(config, dict):
                 self.config = CommentedMap(config.items())
             else:
@@ -422,6 +470,8 @@ class YamlConfig:
             raise UnfurlError(f"Error saving {self.path}", True)
 
     def save(self):
+        if self.readonly:
+            raise UnfurlError(f"Can not save {self.path}, it was loaded as read-only")
         output = six.StringIO()
         self.dump(output)
         if self.path:
@@ -446,7 +496,11 @@ class YamlConfig:
     @property
     def yaml(self):
         if not self._yaml:
-            self._yaml = make_yaml(self.vault)
+            if self.vault:
+                self._yaml = make_yaml(self.vault)
+            else:
+                # without a vault the shared instance behaves the same
+                self._yaml = yaml
         return self._yaml
 
     def __getstate__(self):
@@ -460,8 +514,11 @@ class YamlConfig:
         if isinstance(self.schema, six.string_types):
             # assume its a file path
             path = self.schema
-            with open(path) as fp:
-                self.schema = json.load(fp)
+            schema = _schemaCache.get(path)
+            if schema is None:
+                with open(path) as fp:
+                    schema = _schemaCache[path] = json.load(fp)
+            self.schema = schema
         else:
             path = None
         baseUri = None
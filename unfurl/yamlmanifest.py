@@ -542,16 +542,16 @@ class YamlManifest(ReadOnlyManifest):
         if self._operationIndex is None:
             operationIndex = {}
             if self.changeSets:
-                # add list() for 3.7
-                for change in reversed(list(self.changeSets.values())):
+                # map (target, operation) to the most recent changeId
+                for change in self.changeSets.values():
                     if not hasattr(change, "target") or not hasattr(
                         change, "operation"
                     ):
                         continue
                     key = (change.target, change.operation)
-                    last = operationIndex.setdefault(key, change.changeId)
-                    if last < change.changeId:
-                        operationIndex[key] = change
+                    last = operationIndex.get(key)
+                    if last is None or last < change.changeId:
+                        operationIndex[key] = change.changeId
             self._operationIndex = operationIndex
         changeId = self._operationIndex.get((target, operation))
         if changeId is not None:
@@ -705,6 +705,8 @@ class YamlManifest(ReadOnlyManifest):
         return save_status(job, output)
 
     def save_job(self, job):
+        # reset the cache of templates loaded from past revisions
+        self._templateCache.clear()
         discovered = CommentedMap()
         changed = self.save_root_resource(discovered)
 